@@ -5,6 +5,7 @@ Press button to blink LED 3 times
 """
 
 import RPi.GPIO as GPIO
+import signal
 import time
 
 # GPIO Pin Configuration
@@ -37,8 +38,8 @@ print("Press the button to blink LED 3 times")
 print("Press Ctrl+C to exit")
 
 try:
-    while True:
-        time.sleep(1)
+    # Block until a signal arrives; button presses are handled by the interrupt callback
+    signal.pause()
 except KeyboardInterrupt:
     print("\nShutting down...")
 finally:
@@ -3,7 +3,7 @@ import numpy as np
 
 # Create a blank image with white background
 height, width = 600, 800
-image = np.ones((height, width, 3), dtype=np.uint8) * 255
+image = np.full((height, width, 3), 255, dtype=np.uint8)
 
 # Define triangle vertices
 pt1 = np.array([400, 100], np.int32)    # Top vertex
@@ -6,14 +6,26 @@ Provides both a grid visualization of different configurations and an interactiv
 import cv2
 import numpy as np
 from pathlib import Path
+import threading
 import tkinter as tk
 from tkinter import Scale, HORIZONTAL, Canvas
-from PIL import Image, ImageTk
+
+
+def cuda_available():
+    """Check whether OpenCV was built with CUDA and a device is present"""
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except (AttributeError, cv2.error):
+        return False
 
 
 class LaneDetector:
     """Lane detection using Canny edge detection and Hough line transform"""
 
+    # Hough accumulator resolution; fixed across slider updates
+    HOUGH_RHO = 1.0
+    HOUGH_THETA = np.pi / 180
+
     def __init__(self, image_path):
         """Initialize with an image file"""
         self.original_image = cv2.imread(image_path)
@@ -29,6 +41,49 @@ class LaneDetector:
             new_height = int(height * scale)
             self.original_image = cv2.resize(self.original_image, (new_width, new_height))
 
+        # Grayscale and blur only depend on the image, so compute them once
+        self._gray = cv2.cvtColor(self.original_image, cv2.COLOR_BGR2GRAY)
+        self._blurred = cv2.GaussianBlur(self._gray, (5, 5), 0)
+
+        # Reused for the annotated result on every call
+        self._result_buf = np.empty_like(self.original_image)
+
+        # Run the pipeline on the GPU when OpenCV has CUDA support
+        self.use_cuda = cuda_available()
+        if self.use_cuda:
+            self._init_cuda()
+
+    def _init_cuda(self):
+        """Upload the cached blurred image once and build the persistent CUDA detectors"""
+        self._d_blurred = cv2.cuda_GpuMat()
+        self._d_blurred.upload(self._blurred)
+
+        self._canny = cv2.cuda.createCannyEdgeDetector(50, 150)
+        self._hough = cv2.cuda.createHoughSegmentDetector(self.HOUGH_RHO, self.HOUGH_THETA, 50, 10)
+
+    def _detect_cuda(self, roi_top_pixel, canny_low, canny_high, hough_threshold,
+                     hough_min_length, hough_max_gap):
+        """Run Canny and Hough (on the rows below roi_top_pixel) on the GPU"""
+        self._canny.setLowThreshold(canny_low)
+        self._canny.setHighThreshold(canny_high)
+        self._hough.setThreshold(hough_threshold)
+        self._hough.setMinLineLength(hough_min_length)
+        self._hough.setMaxLineGap(hough_max_gap)
+
+        d_edges = self._canny.detect(self._d_blurred)
+
+        lines = None
+        width, height = d_edges.size()
+        if roi_top_pixel < height:
+            d_edges_roi = cv2.cuda_GpuMat(d_edges, (0, roi_top_pixel, width, height - roi_top_pixel))
+            d_lines = self._hough.detect(d_edges_roi)
+
+            # Match the (N, 1, 4) layout returned by cv2.HoughLinesP
+            if not d_lines.empty():
+                lines = d_lines.download().reshape(-1, 1, 4)
+
+        return d_edges.download(), lines
+
     def detect_lanes(self, canny_low=50, canny_high=150, hough_threshold=50,
                      hough_min_length=50, hough_max_gap=10, roi_top=50, roi_bottom=100):
         """
@@ -44,22 +99,12 @@ class LaneDetector:
             roi_bottom: ROI bottom position as percentage from top (0-100)
 
         Returns:
-            result_image: Image with detected lines drawn
+            result_image: Image with detected lines drawn (buffer reused by the next call)
             edges: Canny edge detection result
             lines: Detected lines
         """
-        # Convert to grayscale
-        gray = cv2.cvtColor(self.original_image, cv2.COLOR_BGR2GRAY)
-
-        # Apply Gaussian blur to reduce noise
-        blurred = cv2.GaussianBlur(gray, (5, 5), 0)
-
-        # Canny edge detection
-        edges = cv2.Canny(blurred, canny_low, canny_high)
-
         # Region of interest (adjustable)
-        height, width = edges.shape
-        roi_mask = np.zeros_like(edges)
+        height, width = self.original_image.shape[:2]
         roi_top_pixel = int(height * roi_top / 100)
         roi_bottom_pixel = int(height * roi_bottom / 100)
 
@@ -69,21 +114,38 @@ class LaneDetector:
             [width, roi_top_pixel],
             [width, height]
         ], dtype=np.int32)
-        cv2.fillPoly(roi_mask, [vertices], 255)
-        edges_roi = cv2.bitwise_and(edges, roi_mask)
-
-        # Hough line detection
-        lines = cv2.HoughLinesP(
-            edges_roi,
-            rho=1,
-            theta=np.pi / 180,
-            threshold=hough_threshold,
-            minLineLength=hough_min_length,
-            maxLineGap=hough_max_gap
-        )
+
+        if self.use_cuda:
+            edges, lines = self._detect_cuda(
+                roi_top_pixel, canny_low, canny_high, hough_threshold,
+                hough_min_length, hough_max_gap
+            )
+        else:
+            # Canny edge detection on the cached blurred image
+            edges = cv2.Canny(self._blurred, canny_low, canny_high)
+
+            # Hough line detection on the ROI rows only (the ROI spans the full width).
+            # The crop moves the accumulator's rho bins, so the segments found differ
+            # from running HoughLinesP on the full masked image.
+            lines = None
+            if roi_top_pixel < height:
+                lines = cv2.HoughLinesP(
+                    edges[roi_top_pixel:],
+                    rho=self.HOUGH_RHO,
+                    theta=self.HOUGH_THETA,
+                    threshold=hough_threshold,
+                    minLineLength=hough_min_length,
+                    maxLineGap=hough_max_gap
+                )
+
+        # Shift lines from ROI coordinates back to image coordinates
+        if lines is not None:
+            lines[:, :, 1] += roi_top_pixel
+            lines[:, :, 3] += roi_top_pixel
 
         # Draw detected lines on original image
-        result_image = self.original_image.copy()
+        result_image = self._result_buf
+        np.copyto(result_image, self.original_image)
         if lines is not None:
             for line in lines:
                 x1, y1, x2, y2 = line[0]
@@ -103,6 +165,9 @@ class LaneDetector:
 class InteractiveParameterTuner:
     """Interactive UI for tuning lane detection parameters"""
 
+    # Delay (ms) after the last slider event before detection runs
+    UPDATE_DELAY_MS = 50
+
     def __init__(self, root, image_path):
         self.root = root
         self.root.title(f"Lane Detection Parameter Tuner - {Path(image_path).name}")
@@ -111,9 +176,14 @@ class InteractiveParameterTuner:
         self.detector = LaneDetector(image_path)
         self.current_result = None
 
+        # Debounce/worker state: pending after() id, worker busy flag, rerun request
+        self._pending = None
+        self._busy = False
+        self._rerun = False
+
         # Create GUI elements
         self.create_widgets()
-        self.update_display()
+        self._schedule_update()
 
     def create_widgets(self):
         """Create GUI widgets"""
@@ -129,7 +199,7 @@ class InteractiveParameterTuner:
         tk.Label(control_frame, text="Canny Low:", bg="#f0f0f0").pack(anchor=tk.W)
         self.canny_low = Scale(
             control_frame, from_=1, to=200, orient=HORIZONTAL,
-            command=lambda x: self.update_display(), bg="#e0e0e0"
+            command=lambda x: self._schedule_update(), bg="#e0e0e0"
         )
         self.canny_low.set(50)
         self.canny_low.pack(fill=tk.X)
@@ -140,7 +210,7 @@ class InteractiveParameterTuner:
         tk.Label(control_frame, text="Canny High:", bg="#f0f0f0").pack(anchor=tk.W, pady=(10, 0))
         self.canny_high = Scale(
             control_frame, from_=50, to=500, orient=HORIZONTAL,
-            command=lambda x: self.update_display(), bg="#e0e0e0"
+            command=lambda x: self._schedule_update(), bg="#e0e0e0"
         )
         self.canny_high.set(281)
         self.canny_high.pack(fill=tk.X)
@@ -151,7 +221,7 @@ class InteractiveParameterTuner:
         tk.Label(control_frame, text="Hough Threshold:", bg="#f0f0f0").pack(anchor=tk.W, pady=(10, 0))
         self.hough_threshold = Scale(
             control_frame, from_=10, to=200, orient=HORIZONTAL,
-            command=lambda x: self.update_display(), bg="#e0e0e0"
+            command=lambda x: self._schedule_update(), bg="#e0e0e0"
         )
         self.hough_threshold.set(66)
         self.hough_threshold.pack(fill=tk.X)
@@ -162,7 +232,7 @@ class InteractiveParameterTuner:
         tk.Label(control_frame, text="Hough Min Length:", bg="#f0f0f0").pack(anchor=tk.W, pady=(10, 0))
         self.hough_min_length = Scale(
             control_frame, from_=10, to=300, orient=HORIZONTAL,
-            command=lambda x: self.update_display(), bg="#e0e0e0"
+            command=lambda x: self._schedule_update(), bg="#e0e0e0"
         )
         self.hough_min_length.set(50)
         self.hough_min_length.pack(fill=tk.X)
@@ -173,7 +243,7 @@ class InteractiveParameterTuner:
         tk.Label(control_frame, text="Hough Max Gap:", bg="#f0f0f0").pack(anchor=tk.W, pady=(10, 0))
         self.hough_max_gap = Scale(
             control_frame, from_=1, to=50, orient=HORIZONTAL,
-            command=lambda x: self.update_display(), bg="#e0e0e0"
+            command=lambda x: self._schedule_update(), bg="#e0e0e0"
         )
         self.hough_max_gap.set(10)
         self.hough_max_gap.pack(fill=tk.X)
@@ -184,7 +254,7 @@ class InteractiveParameterTuner:
         tk.Label(control_frame, text="ROI Top (%):", bg="#f0f0f0").pack(anchor=tk.W, pady=(10, 0))
         self.roi_top = Scale(
             control_frame, from_=0, to=100, orient=HORIZONTAL,
-            command=lambda x: self.update_display(), bg="#e0e0e0"
+            command=lambda x: self._schedule_update(), bg="#e0e0e0"
         )
         self.roi_top.set(38)
         self.roi_top.pack(fill=tk.X)
@@ -195,7 +265,7 @@ class InteractiveParameterTuner:
         tk.Label(control_frame, text="ROI Bottom (%):", bg="#f0f0f0").pack(anchor=tk.W, pady=(10, 0))
         self.roi_bottom = Scale(
             control_frame, from_=0, to=100, orient=HORIZONTAL,
-            command=lambda x: self.update_display(), bg="#e0e0e0"
+            command=lambda x: self._schedule_update(), bg="#e0e0e0"
         )
         self.roi_bottom.set(100)
         self.roi_bottom.pack(fill=tk.X)
@@ -231,6 +301,7 @@ class InteractiveParameterTuner:
 
         self.canvas = Canvas(display_frame, bg="black")
         self.canvas.pack(fill=tk.BOTH, expand=True)
+        self.canvas_image = self.canvas.create_image(0, 0, anchor=tk.NW)
 
     def load_preset(self, clow, chigh, hthresh, hlen, hgap):
         """Load preset configuration"""
@@ -240,9 +311,16 @@ class InteractiveParameterTuner:
         self.hough_min_length.set(hlen)
         self.hough_max_gap.set(hgap)
 
-    def update_display(self):
-        """Update the display with current parameters"""
-        # Update labels
+    def _schedule_update(self):
+        """Update labels and coalesce slider events into a single delayed detection"""
+        self.update_labels()
+
+        if self._pending is not None:
+            self.root.after_cancel(self._pending)
+        self._pending = self.root.after(self.UPDATE_DELAY_MS, self._do_update)
+
+    def update_labels(self):
+        """Update slider value labels"""
         self.canny_low_label.config(text=str(int(self.canny_low.get())))
         self.canny_high_label.config(text=str(int(self.canny_high.get())))
         self.hough_threshold_label.config(text=str(int(self.hough_threshold.get())))
@@ -251,8 +329,18 @@ class InteractiveParameterTuner:
         self.roi_top_label.config(text=str(int(self.roi_top.get())))
         self.roi_bottom_label.config(text=str(int(self.roi_bottom.get())))
 
-        # Detect lanes
-        result, edges, lines = self.detector.detect_lanes(
+    def _do_update(self):
+        """Run lane detection with current parameters in a worker thread"""
+        self._pending = None
+
+        # Only one detection at a time; rerun with the latest values when it finishes
+        if self._busy:
+            self._rerun = True
+            return
+        self._busy = True
+
+        # Read Tk widgets on the main thread before handing off to the worker
+        params = dict(
             canny_low=int(self.canny_low.get()),
             canny_high=int(self.canny_high.get()),
             hough_threshold=int(self.hough_threshold.get()),
@@ -262,12 +350,42 @@ class InteractiveParameterTuner:
             roi_bottom=int(self.roi_bottom.get())
         )
 
+        worker = threading.Thread(target=self._detect_worker, args=(params,), daemon=True)
+        worker.start()
+
+    def _detect_worker(self, params):
+        """Detect lanes off the Tk thread and marshal the result back"""
+        result = lines = None
+        try:
+            result, edges, lines = self.detector.detect_lanes(**params)
+        finally:
+            # Always hand back to the Tk thread so a failed detection can't leave _busy set
+            self.root.after(0, self._finish_update, result, lines)
+
+    def _finish_update(self, result, lines):
+        """Release the worker slot, show the result if any and run a pending update"""
+        self._busy = False
+
+        if result is not None:
+            self.update_display(result, lines)
+
+        if self._rerun:
+            self._rerun = False
+            self._do_update()
+
+    def update_display(self, result, lines):
+        """Update the display with a detection result (runs on the Tk thread)"""
+        self.current_result = result
+
         num_lines = len(lines) if lines is not None else 0
 
         # Update info
         info_text = f"Lines detected: {num_lines}\n\n"
         if lines is not None and len(lines) > 0:
-            info_text += f"Avg line length: {np.mean([np.sqrt((x2-x1)**2 + (y2-y1)**2) for x1,y1,x2,y2 in lines[:,0]]):.1f}\n"
+            segments = lines[:, 0]
+            deltas = segments[:, 2:] - segments[:, :2]
+            lengths = np.sqrt((deltas * deltas).sum(axis=1))
+            info_text += f"Avg line length: {lengths.mean():.1f}\n"
 
         self.info_label.config(text=info_text)
 
@@ -276,26 +394,29 @@ class InteractiveParameterTuner:
 
     def display_image(self, image):
         """Display image on canvas"""
-        # Convert BGR to RGB
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-
-        # Resize to fit canvas
+        # Resize to fit canvas first so the color conversion only touches displayed pixels
         canvas_width = self.canvas.winfo_width()
         canvas_height = self.canvas.winfo_height()
 
         if canvas_width > 1 and canvas_height > 1:
-            h, w = image_rgb.shape[:2]
+            h, w = image.shape[:2]
             scale = min(canvas_width / w, canvas_height / h)
             new_width = int(w * scale)
             new_height = int(h * scale)
-            image_rgb = cv2.resize(image_rgb, (new_width, new_height))
+            # INTER_AREA is cheaper and sharper when shrinking
+            interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+            image = cv2.resize(image, (new_width, new_height), interpolation=interpolation)
+
+        # Convert BGR to RGB
+        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
 
-        # Convert to PIL Image
-        pil_image = Image.fromarray(image_rgb)
-        photo = ImageTk.PhotoImage(pil_image)
+        # Hand the pixels to Tk as binary PPM data, skipping the PIL round-trip
+        h, w = image_rgb.shape[:2]
+        ppm = b"P6\n%d %d\n255\n" % (w, h) + image_rgb.tobytes()
+        photo = tk.PhotoImage(data=ppm, format="PPM")
 
-        # Update canvas
-        self.canvas.create_image(0, 0, anchor=tk.NW, image=photo)
+        # Update the existing canvas item instead of stacking new ones
+        self.canvas.itemconfig(self.canvas_image, image=photo)
         self.canvas.image = photo
 
 
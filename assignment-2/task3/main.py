@@ -2,6 +2,23 @@ import cv2
 import numpy as np
 import os
 
+# Unit circle sampled every 5 degrees over 0..360 inclusive, the vertices
+# cv2.circle gets from ellipse2Poly for radii >= 15 px
+_outline_angles = np.deg2rad(np.arange(0, 365, 5))
+CIRCLE_OUTLINE = np.stack([np.cos(_outline_angles), np.sin(_outline_angles)], axis=1)
+
+# Fractional bits for outline vertices, matching cv2.circle's sub-pixel precision
+OUTLINE_SHIFT = 16
+
+def create_window(name):
+    """Create a display window, using OpenGL texture upload when OpenCV supports it"""
+    try:
+        cv2.namedWindow(name, cv2.WINDOW_OPENGL | cv2.WINDOW_AUTOSIZE)
+    except cv2.error:
+        # OpenCV built without OpenGL support
+        cv2.namedWindow(name, cv2.WINDOW_AUTOSIZE)
+
+
 def count_coins(image_path):
     """
     Load an image and detect coins using circle detection.
@@ -37,20 +54,25 @@ def count_coins(image_path):
 
     # Process detected circles
     if circles is not None:
-        circles = np.uint16(np.around(circles))
-        coin_count = len(circles[0])
+        # Round the float32 (N, 3) view to the integer centers/radii cv2.circle would get
+        circles = np.rint(circles[0])
+        coin_count = len(circles)
         print(f"Number of coins detected: {coin_count}")
 
-        # Draw circles and numbers
-        for idx, (x, y, radius) in enumerate(circles[0]):
-            # Draw circle outline
-            cv2.circle(image, (x, y), radius, (0, 255, 0), 2)
+        centers = circles[:, :2].astype(np.int32)
+
+        # Draw all circle outlines in one call from their polygon approximations,
+        # with fixed-point vertices so the result matches cv2.circle exactly
+        outlines = circles[:, None, :2] + circles[:, None, 2:] * CIRCLE_OUTLINE
+        outlines = np.rint(outlines * (1 << OUTLINE_SHIFT)).astype(np.int32)
+        cv2.polylines(image, list(outlines), True, (0, 255, 0), 2, shift=OUTLINE_SHIFT)
 
-            # Draw a smaller filled circle at center
-            cv2.circle(image, (x, y), 3, (0, 0, 255), -1)
+        # Draw all center dots in one call; a one-point closed polyline at
+        # thickness 6 renders the same disc as cv2.circle(..., 3, ..., -1)
+        cv2.polylines(image, list(centers.reshape(-1, 1, 2)), True, (0, 0, 255), 6)
 
-            # Put coin number
-            coin_number = idx + 1
+        # Put coin numbers (glyph rendering still needs one call per label)
+        for coin_number, (x, y) in enumerate(centers.tolist(), start=1):
             cv2.putText(
                 image,
                 str(coin_number),
@@ -64,6 +86,7 @@ def count_coins(image_path):
         print("No coins detected")
 
     # Display the result
+    create_window("Coin Detection")
     cv2.imshow("Coin Detection", image)
 
     # Save the output image
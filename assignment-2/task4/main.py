@@ -1,66 +1,411 @@
 import cv2
+import numpy as np
 import os
+import queue
+import threading
 
-def detect_faces_webcam():
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CASCADE_PATH = os.path.join(SCRIPT_DIR, 'haarcascade_frontalface_default.xml')
+
+# Faces are detected on a frame downscaled by this factor, then mapped back
+DETECTION_DOWNSCALE = 2
+
+# Smallest face (px, on the downscaled frame) the Haar cascade reports
+HAAR_MIN_SIZE = 15
+
+# Optional OpenCV DNN face detector (res10 SSD); used instead of Haar when present
+DNN_PROTOTXT = 'deploy.prototxt'
+DNN_MODEL = 'res10_300x300_ssd_iter_140000.caffemodel'
+DNN_CONFIDENCE = 0.5
+
+# Capacity of the capture->detect and detect->display queues
+PIPELINE_QUEUE_SIZE = 2
+
+# Motion gating: per-pixel diff threshold, minimum motion area (px) and
+# how often (in detections) to rescan the full frame
+MOTION_THRESHOLD = 15
+MOTION_MIN_AREA = 1000
+RESYNC_INTERVAL = 15
+
+# Margin added around rescanned faces, as a fraction of the face size, so the
+# cascade sees enough context to collect its neighbouring hits
+ROI_PADDING = 0.25
+
+# Detectors are loaded once and kept for the life of the process
+_face_net = None
+_face_cascade = None
+
+
+def cuda_available():
+    """Check whether OpenCV was built with CUDA and a device is present"""
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except (AttributeError, cv2.error):
+        return False
+
+
+def load_dnn_face_net(script_dir):
     """
-    Detect faces in real-time using webcam with Haar Cascade classifier.
-    Press 'q' to exit the application.
+    Load the res10 SSD face detector if its model files are next to this script.
+
+    Returns:
+        cv2.dnn.Net, or None if the model files are missing
+    """
+    prototxt_path = os.path.join(script_dir, DNN_PROTOTXT)
+    model_path = os.path.join(script_dir, DNN_MODEL)
+    if not (os.path.exists(prototxt_path) and os.path.exists(model_path)):
+        return None
+
+    net = cv2.dnn.readNetFromCaffe(prototxt_path, model_path)
+    if cuda_available():
+        net.setPreferableBackend(cv2.dnn.DNN_BACKEND_CUDA)
+        net.setPreferableTarget(cv2.dnn.DNN_TARGET_CUDA)
+    return net
+
+
+def detect_faces_dnn(net, frame):
+    """Detect faces with the DNN detector, returning (x, y, w, h) boxes in frame coordinates"""
+    height, width = frame.shape[:2]
+    blob = cv2.dnn.blobFromImage(frame, 1.0, (300, 300), (104.0, 177.0, 123.0))
+    net.setInput(blob)
+    detections = net.forward()
+
+    # Each detection row is [image_id, label, confidence, x1, y1, x2, y2] with normalized coords
+    faces = []
+    for confidence, x1, y1, x2, y2 in detections[0, 0, :, 2:7]:
+        if confidence < DNN_CONFIDENCE:
+            continue
+        # The SSD can return coordinates outside [0, 1]; clamp both ends
+        x1 = min(max(int(x1 * width), 0), width)
+        y1 = min(max(int(y1 * height), 0), height)
+        x2 = min(max(int(x2 * width), 0), width)
+        y2 = min(max(int(y2 * height), 0), height)
+        if x2 <= x1 or y2 <= y1:
+            continue
+        faces.append((x1, y1, x2 - x1, y2 - y1))
+    return faces
+
+
+def detect_faces_haar(face_cascade, gray):
+    """Detect faces with the Haar cascade, returning (x, y, w, h) boxes in frame coordinates"""
+    # Detect faces on a half-resolution frame to cut the sliding-window work
+    small = cv2.resize(gray, None, fx=1 / DETECTION_DOWNSCALE, fy=1 / DETECTION_DOWNSCALE,
+                       interpolation=cv2.INTER_LINEAR)
+    faces = face_cascade.detectMultiScale(
+        small,
+        scaleFactor=1.2,
+        minNeighbors=5,
+        minSize=(HAAR_MIN_SIZE, HAAR_MIN_SIZE),
+        maxSize=(150, 150)
+    )
+
+    # Scale detections back to full-frame coordinates
+    return [(x * DETECTION_DOWNSCALE, y * DETECTION_DOWNSCALE,
+             w * DETECTION_DOWNSCALE, h * DETECTION_DOWNSCALE) for (x, y, w, h) in faces]
+
+
+def load_face_detectors():
     """
-    # Load the pre-trained Haar Cascade classifier for face detection
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    cascade_path = os.path.join(script_dir, 'haarcascade_frontalface_default.xml')
-    face_cascade = cv2.CascadeClassifier(cascade_path)
+    Load the face detectors once per process.
 
+    Returns:
+        face_net, face_cascade: the DNN net (or None if its model is missing) and,
+        when there is no DNN net, the Haar cascade (or None if it failed to load)
+    """
+    global _face_net, _face_cascade
+    if _face_net is None and _face_cascade is None:
+        _face_net = load_dnn_face_net(SCRIPT_DIR)
+        if _face_net is None:
+            # Load the pre-trained Haar Cascade classifier for face detection
+            face_cascade = cv2.CascadeClassifier(CASCADE_PATH)
+            if not face_cascade.empty():
+                _face_cascade = face_cascade
+    return _face_net, _face_cascade
+
+
+def warm_up():
+    """Load the detectors and create the CUDA context ahead of the first frame"""
+    face_net, _ = load_face_detectors()
+
+    if cuda_available():
+        cv2.cuda.setDevice(0)
+        cv2.cuda_GpuMat(1, 1, cv2.CV_8UC1)
+
+    if face_net is not None:
+        # The first forward pass allocates the network's buffers
+        face_net.setInput(np.zeros((1, 3, 300, 300), dtype=np.float32))
+        face_net.forward()
+
+
+def create_window(name):
+    """Create a display window, using OpenGL texture upload when OpenCV supports it"""
+    try:
+        cv2.namedWindow(name, cv2.WINDOW_OPENGL | cv2.WINDOW_AUTOSIZE)
+    except cv2.error:
+        # OpenCV built without OpenGL support
+        cv2.namedWindow(name, cv2.WINDOW_AUTOSIZE)
+
+
+def configure_raw_yuyv(cap):
+    """
+    Ask the camera for raw YUYV frames so the Y plane can be used as grayscale.
+
+    Returns:
+        True if the camera accepted YUYV and RGB conversion was disabled
+    """
+    yuyv = cv2.VideoWriter_fourcc(*'YUYV')
+    cap.set(cv2.CAP_PROP_FOURCC, yuyv)
+    if int(cap.get(cv2.CAP_PROP_FOURCC)) != yuyv:
+        return False
+    return cap.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+
+
+def split_frame(raw):
+    """
+    Split a captured frame into a BGR image for display and a grayscale image for detection.
+
+    Args:
+        raw: Frame from cap.read(), either raw YUYV (H, W, 2) or BGR (H, W, 3)
+
+    Returns:
+        bgr, gray
+    """
+    if raw.ndim == 3 and raw.shape[2] == 2:
+        # Channel 0 of packed YUYV is the luma plane, i.e. the grayscale image
+        gray = raw[:, :, 0].copy()
+        bgr = cv2.cvtColor(raw, cv2.COLOR_YUV2BGR_YUYV)
+        return bgr, gray
+
+    # Backend delivered BGR anyway
+    return raw, cv2.cvtColor(raw, cv2.COLOR_BGR2GRAY)
+
+
+def motion_roi(gray, prev_gray):
+    """
+    Find the region that changed since the previous frame.
+
+    Returns:
+        (x, y, w, h) bounding rectangle of the motion, or None if too little moved
+    """
+    diff = cv2.absdiff(gray, prev_gray)
+    _, mask = cv2.threshold(diff, MOTION_THRESHOLD, 255, cv2.THRESH_BINARY)
+    mask = cv2.dilate(mask, None, iterations=3)
+    x, y, w, h = cv2.boundingRect(mask)
+    if w * h < MOTION_MIN_AREA:
+        return None
+    return x, y, w, h
 
-    if face_cascade.empty():
+
+def boxes_intersect(a, b):
+    """Check whether two (x, y, w, h) boxes overlap"""
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    return ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah
+
+
+def expand_roi(roi, boxes):
+    """Grow roi to the union of itself and every box it intersects, until no box is clipped"""
+    x1, y1, w, h = roi
+    x2, y2 = x1 + w, y1 + h
+    remaining = list(boxes)
+    grown = True
+    while grown:
+        grown = False
+        for box in remaining:
+            if boxes_intersect((x1, y1, x2 - x1, y2 - y1), box):
+                bx, by, bw, bh = box
+                x1, y1 = min(x1, bx), min(y1, by)
+                x2, y2 = max(x2, bx + bw), max(y2, by + bh)
+                remaining.remove(box)
+                grown = True
+                break
+    return x1, y1, x2 - x1, y2 - y1
+
+
+def _grow_span(lo, hi, size, limit):
+    """Widen [lo, hi) around its center to at least size, clamped to [0, limit)"""
+    if hi - lo >= size:
+        return lo, hi
+    lo = max(0, (lo + hi - size) // 2)
+    hi = min(limit, lo + size)
+    return max(0, hi - size), hi
+
+
+def rescan_roi(roi, faces, width, height):
+    """
+    Build the region to rescan with the Haar cascade for a motion box.
+
+    The box is grown over every previous face it touches, padded by ROI_PADDING
+    of the largest such face, kept at least the cascade's minimum face size and
+    clamped to the frame.
+
+    Returns:
+        (x, y, w, h) region, and the previous faces inside it
+    """
+    x, y, w, h = expand_roi(roi, faces)
+    touched = [face for face in faces if boxes_intersect(face, (x, y, w, h))]
+    pad = max([int(ROI_PADDING * max(fw, fh)) for (_, _, fw, fh) in touched], default=0)
+
+    x1, y1 = max(0, x - pad), max(0, y - pad)
+    x2, y2 = min(width, x + w + pad), min(height, y + h + pad)
+
+    min_side = HAAR_MIN_SIZE * DETECTION_DOWNSCALE
+    x1, x2 = _grow_span(x1, x2, min_side, width)
+    y1, y2 = _grow_span(y1, y2, min_side, height)
+
+    # Padding may reach further faces; take those in whole rather than clipped
+    roi = expand_roi((x1, y1, x2 - x1, y2 - y1), faces)
+    return roi, [face for face in faces if boxes_intersect(face, roi)]
+
+
+def put_latest(q, item):
+    """Put an item on a bounded queue without blocking, dropping the oldest entry when full"""
+    while True:
+        try:
+            q.put_nowait(item)
+            return
+        except queue.Full:
+            try:
+                q.get_nowait()
+            except queue.Empty:
+                pass
+
+
+def capture_frames(cap, frames, stop):
+    """Capture stage: read frames until stopped, then send a None sentinel"""
+    frame_count = 0
+    try:
+        while not stop.is_set():
+            # Each frame gets its own buffer since it is still in flight downstream
+            ret, raw = cap.read()
+
+            if not ret:
+                print("Error: Failed to read frame")
+                break
+
+            frame_count += 1
+            put_latest(frames, (frame_count, raw))
+    finally:
+        put_latest(frames, None)
+
+
+def detect_frames(frames, results, face_net, face_cascade):
+    """
+    Detection stage: detect faces on captured frames until the None sentinel arrives.
+    Frames with no motion reuse the previous detections. With the Haar cascade
+    only the region that moved is rescanned; the DNN detector always scans the
+    full frame, since its input is resized to a fixed 300x300 anyway. A
+    full-frame pass runs every RESYNC_INTERVAL frames.
+    """
+    prev_gray = None
+    faces = []
+    processed = 0
+    try:
+        while True:
+            item = frames.get()
+            if item is None:
+                break
+
+            frame_count, raw = item
+            frame, gray = split_frame(raw)
+
+            if prev_gray is None or processed % RESYNC_INTERVAL == 0:
+                height, width = gray.shape
+                roi = (0, 0, width, height)
+            else:
+                roi = motion_roi(gray, prev_gray)
+            prev_gray = gray
+            processed += 1
+
+            # No motion: the previous detections still hold
+            if roi is None:
+                pass
+            elif face_net is not None:
+                # Cropping would only stretch the strip to 300x300, so run on the full frame
+                faces = detect_faces_dnn(face_net, frame)
+            else:
+                # Scan previous faces touched by the motion whole and with margin
+                height, width = gray.shape
+                roi, touched = rescan_roi(roi, faces, width, height)
+                x, y, w, h = roi
+                found = detect_faces_haar(face_cascade, gray[y:y + h, x:x + w])
+
+                if touched and not found:
+                    # A face seen here before was lost in the crop; confirm on the full frame
+                    faces = detect_faces_haar(face_cascade, gray)
+                else:
+                    # Keep faces outside the scanned region; those inside it are replaced
+                    kept = [face for face in faces if not boxes_intersect(face, roi)]
+                    faces = kept + [(fx + x, fy + y, fw, fh) for (fx, fy, fw, fh) in found]
+
+            put_latest(results, (frame_count, frame, faces))
+    finally:
+        put_latest(results, None)
+
+
+def detect_faces_webcam(cap=None):
+    """
+    Detect faces in real-time using webcam.
+    Uses the DNN face detector when its model files are available, otherwise
+    falls back to the Haar Cascade classifier.
+    Capture, detection and display run as a pipeline on separate threads.
+    Press 'q' to exit the application.
+
+    Args:
+        cap: Optional already-open cv2.VideoCapture to reuse across runs;
+             it is left open when the loop exits
+    """
+    face_net, face_cascade = load_face_detectors()
+
+    if face_net is None and face_cascade is None:
         print("Error: Could not load face cascade classifier")
         return
 
-    # Initialize webcam (0 is the default camera)
-    cap = cv2.VideoCapture(0)
+    # Initialize webcam (0 is the default camera) unless the caller owns one
+    owns_capture = cap is None
+    if owns_capture:
+        cap = cv2.VideoCapture(0)
 
     if not cap.isOpened():
         print("Error: Could not open webcam")
         return
 
-    print("Face Detection Started")
+    # Raw YUYV gives grayscale for free; fall back to BGR capture otherwise
+    if not configure_raw_yuyv(cap):
+        print("Camera does not provide raw YUYV, using BGR capture")
+
+    print(f"Face Detection Started ({'DNN' if face_net is not None else 'Haar Cascade'})")
     print("Press 'q' to exit")
     print("Press 's' to save a frame with detected faces")
 
-    frame_count = 0
+    create_window('Face Detection')
 
-    while True:
-        # Read frame from webcam
-        ret, frame = cap.read()
+    # Capture and detection run on worker threads; drawing and display stay on this one
+    frames = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    results = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    stop = threading.Event()
+    workers = [
+        threading.Thread(target=capture_frames, args=(cap, frames, stop), daemon=True),
+        threading.Thread(target=detect_frames, args=(frames, results, face_net, face_cascade), daemon=True),
+    ]
+    for worker in workers:
+        worker.start()
 
-        if not ret:
-            print("Error: Failed to read frame")
+    while True:
+        item = results.get()
+        if item is None:
             break
 
-        frame_count += 1
-
-        # Convert to grayscale for detection
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-
-        # Detect faces
-        faces = face_cascade.detectMultiScale(
-            gray,
-            scaleFactor=1.1,
-            minNeighbors=5,
-            minSize=(30, 30),
-            maxSize=(300, 300)
-        )
+        frame_count, frame, faces = item
 
         # Draw rectangles around detected faces
-        face_count = 0
-        for (x, y, w, h) in faces:
-            face_count += 1
-
+        face_count = len(faces)
+        for face_number, (x, y, w, h) in enumerate(faces, start=1):
             # Draw face rectangle
             cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
 
             # Label the face
-            cv2.putText(frame, f'Face {face_count}', (x, y - 10),
+            cv2.putText(frame, f'Face {face_number}', (x, y - 10),
                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
 
 
@@ -81,17 +426,25 @@ def detect_faces_webcam():
             break
         elif key == ord('s'):
             # Save the frame with detected faces
-            output_dir = os.path.dirname(os.path.abspath(__file__))
-            filename = os.path.join(output_dir, f'face_detection_{frame_count}.jpg')
+            filename = os.path.join(SCRIPT_DIR, f'face_detection_{frame_count}.jpg')
             cv2.imwrite(filename, frame)
             print(f"Frame saved: {filename}")
 
+    # Stop the pipeline before releasing the camera it reads from
+    stop.set()
+    for worker in workers:
+        worker.join()
+
     # Release resources
-    cap.release()
+    if owns_capture:
+        cap.release()
     cv2.destroyAllWindows()
     print("Face detection completed")
 
 
 if __name__ == "__main__":
     detect_faces_webcam()
+else:
+    # Importers (e.g. a long-running service) get warm detectors up front
+    warm_up()
 
@@ -0,0 +1,81 @@
+"""
+Frame-sequence checks for the motion-gated Haar detection in detect_frames
+"""
+
+import queue
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+
+import main
+
+WIDTH, HEIGHT = 640, 480
+FACE = (182, 82, 238, 238)
+MOUTH = (260, 250, 80, 30)
+
+# Like the real cascade, the fake only finds a face that has context around it
+CONTEXT_MARGIN = 20
+
+
+def fake_detect_faces_haar(face_cascade, gray):
+    """Report the bounding box of the non-zero pixels if it is clear of the crop border"""
+    ys, xs = np.nonzero(gray)
+    if len(xs) == 0:
+        return []
+    x1, x2 = int(xs.min()), int(xs.max()) + 1
+    y1, y2 = int(ys.min()), int(ys.max()) + 1
+    height, width = gray.shape
+    if (x1 < CONTEXT_MARGIN or y1 < CONTEXT_MARGIN
+            or width - x2 < CONTEXT_MARGIN or height - y2 < CONTEXT_MARGIN):
+        return []
+    return [(x1, y1, x2 - x1, y2 - y1)]
+
+
+def make_frame(face=True, mouth_open=False):
+    """Synthetic BGR frame with a bright face square and a mouth that can change"""
+    frame = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+    if face:
+        x, y, w, h = FACE
+        frame[y:y + h, x:x + w] = 200
+        if mouth_open:
+            mx, my, mw, mh = MOUTH
+            frame[my:my + mh, mx:mx + mw] = 120
+    return frame
+
+
+def run_detect_frames(raw_frames):
+    """Run the detection stage over frames and return the face count per frame"""
+    frames = queue.Queue()
+    results = queue.Queue()
+    for frame_count, raw in enumerate(raw_frames, start=1):
+        frames.put((frame_count, raw))
+    frames.put(None)
+
+    main.detect_frames(frames, results, None, None)
+
+    counts = []
+    while True:
+        item = results.get_nowait()
+        if item is None:
+            return counts
+        _, _, faces = item
+        counts.append(len(faces))
+
+
+def test_talking_face_stays_detected(monkeypatch):
+    monkeypatch.setattr(main, "detect_faces_haar", fake_detect_faces_haar)
+
+    # Only the mouth moves, every other frame
+    raw_frames = [make_frame(mouth_open=i % 2 == 1) for i in range(10)]
+
+    assert run_detect_frames(raw_frames) == [1] * 10
+
+
+def test_face_leaving_is_dropped(monkeypatch):
+    monkeypatch.setattr(main, "detect_faces_haar", fake_detect_faces_haar)
+
+    raw_frames = [make_frame(), make_frame(), make_frame(face=False), make_frame(face=False)]
+
+    assert run_detect_frames(raw_frames) == [1, 1, 0, 0]